@@ -1,25 +1,150 @@
 import argparse
+import hashlib
+import json
 import os
+import re
 import shutil
+import subprocess
 import sys
+import tarfile
 import tempfile
-from git import Repo
-import docker
-from docker.errors import BuildError, APIError
-from loguru import logger
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# docker, GitPython and loguru are imported on first use so that --help,
+# argument errors and infer_image_name do not pay for loading them.
+_logger = None
 
-def clone_repo(repo_url, branch, dest_dir):
-    """Clones the repository to the destination directory."""
+def _get_logger():
+    """Imports loguru on first use and returns its logger."""
+    global _logger
+    if _logger is None:
+        from loguru import logger
+        _logger = logger
+    return _logger
+
+def _run_git(*args):
+    """Runs a git command and returns its stdout. Never prompts for credentials."""
+    result = subprocess.run(
+        ["git", *args],
+        check=True,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+    )
+    return result.stdout
+
+def clone_repo(repo_url, branch, dest_dir, full_history=False):
+    """
+    Clones the repository to the destination directory.
+    Only the tip commit of the branch is fetched unless full_history is set.
+    """
+    logger = _get_logger()
     logger.info(f"Cloning repository: {repo_url} (branch: {branch})")
+    options = ["--branch", branch]
+    if not full_history:
+        options += ["--depth=1", "--single-branch", "--no-tags"]
     try:
-        Repo.clone_from(repo_url, dest_dir, branch=branch)
+        _run_git("clone", *options, "--", repo_url, dest_dir)
         return True
-    except Exception as e:
+    except subprocess.CalledProcessError as e:
+        logger.error(f"Failed to clone repository: {e.stderr.strip()}")
+        return False
+    except OSError as e:
         logger.error(f"Failed to clone repository: {e}")
         return False
 
-def build_image(client, context_path, dockerfile_path, full_image_name, build_args=None):
-    """Builds the Docker image."""
+def pull_cache_images(client, cache_from):
+    """
+    Pulls the build cache source images into the local daemon.
+    The classic builder only uses cache sources that exist locally. A missing image
+    (e.g. the very first build) is not an error.
+    """
+    from docker.errors import APIError
+    logger = _get_logger()
+    for cache_image in cache_from:
+        try:
+            logger.info(f"Pulling cache image: {cache_image}")
+            client.images.pull(cache_image)
+        except APIError as e:
+            logger.info(f"Cache image {cache_image} not available: {e}")
+
+# Label recording the build context fingerprint an image was built from.
+CTX_DIGEST_LABEL = "buildpub.ctx-digest"
+
+def read_dockerignore(context_path):
+    """Returns the exclude patterns from the context's .dockerignore, or None if there is none."""
+    dockerignore = os.path.join(context_path, '.dockerignore')
+    if not os.path.exists(dockerignore):
+        return None
+    with open(dockerignore) as f:
+        return [
+            line.strip() for line in f.read().splitlines()
+            if line.strip() and not line.strip().startswith('#')
+        ]
+
+def create_build_context(context_path, dockerfile_path):
+    """
+    Tars the build context (honouring .dockerignore) the same way docker-py does for a
+    path-based build. Returns the archive and the Dockerfile's name inside it; both can be
+    passed to build_image, and the archive fingerprinted with compute_context_digest, so
+    the context is only walked and archived once.
+    """
+    from docker.api.build import process_dockerfile
+    from docker.utils import tar
+
+    # Makes absolute Dockerfile paths context-relative and embeds Dockerfiles from outside the context
+    dockerfile = process_dockerfile(dockerfile_path, context_path)
+    if dockerfile[1] is not None:
+        # docker-py names an embedded Dockerfile randomly; a content-derived name keeps the fingerprint stable
+        dockerfile = (f".dockerfile.{hashlib.sha1(dockerfile[1].encode()).hexdigest()}", dockerfile[1])
+    context_tar = tar(context_path, exclude=read_dockerignore(context_path), dockerfile=dockerfile)
+    return context_tar, dockerfile[0]
+
+def compute_context_digest(context_tar, dockerfile_path, build_args=None):
+    """
+    Fingerprints everything that feeds the build: the build context tar, the
+    Dockerfile path and the build args.
+    Member names, modes and contents are hashed but not timestamps or owners, so a
+    fresh clone of the same commit yields the same digest. Rewinds context_tar.
+    """
+    digest = hashlib.sha256()
+    digest.update(dockerfile_path.encode())
+    digest.update(json.dumps(build_args or {}, sort_keys=True).encode())
+    with tarfile.open(fileobj=context_tar, mode='r|') as archive:
+        for member in archive:
+            digest.update(f"\0{member.name}\0{member.mode:o}\0{member.type.decode()}\0{member.linkname}\0".encode())
+            if member.isfile():
+                f = archive.extractfile(member)
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+    context_tar.seek(0)
+    return digest.hexdigest()
+
+def get_image_label(client, full_image_name, label):
+    """Returns a label of a local image, or None if the image or label does not exist."""
+    from docker.errors import APIError
+    try:
+        return client.images.get(full_image_name).labels.get(label)
+    except APIError:
+        return None
+
+# Number of build output lines shown when a build fails.
+BUILD_FAILURE_CONTEXT_LINES = 100
+
+def build_image(client, context_path, dockerfile_path, full_image_name, build_args=None, cache_from=None, use_buildx=False, labels=None, context_tar=None, context_dockerfile=None):
+    """
+    Builds the Docker image.
+    context_tar is an optional prebuilt archive of context_path and context_dockerfile the
+    Dockerfile's name inside it (see create_build_context); without them docker-py archives
+    the context itself.
+    Images listed in cache_from are used as layer cache sources; without buildx they must
+    already be present locally (see pull_cache_images). If use_buildx is set,
+    the build is delegated to `docker buildx` (BuildKit) instead of the Docker SDK.
+    """
+    from docker.errors import APIError
+    logger = _get_logger()
     logger.info(f"Building image: {full_image_name} using {dockerfile_path}")
     
     # Verify Dockerfile exists
@@ -28,80 +153,219 @@ def build_image(client, context_path, dockerfile_path, full_image_name, build_ar
             logger.error(f"Dockerfile not found at {full_dockerfile_path}")
             return False
 
+    if use_buildx:
+        return build_image_buildx(context_path, full_dockerfile_path, full_image_name, build_args, cache_from, labels)
+
     try:
-        # Note: docker.io/docker/api/client.py build method uses 'path' for the build context
-        # and 'dockerfile' for the relative path to the Dockerfile within that context.
-        image, build_logs = client.images.build(
-            path=context_path,
-            dockerfile=dockerfile_path,
+        # The low-level API streams build output as it is produced instead of
+        # collecting the whole log before returning like client.images.build does.
+        if context_tar is not None:
+            context_kwargs = {'fileobj': context_tar, 'custom_context': True, 'dockerfile': context_dockerfile}
+        else:
+            context_kwargs = {'path': context_path, 'dockerfile': dockerfile_path}
+        build_logs = client.api.build(
+            **context_kwargs,
             tag=full_image_name,
             rm=True, # Remove intermediate containers
-            buildargs=build_args
+            forcerm=True, # ...even if the build fails
+            buildargs=build_args,
+            cache_from=cache_from or None,
+            labels=labels,
+            decode=True
         )
+        image_id = None
+        # The most recent output is kept so a failed build can show what led to the error.
+        recent_output = deque(maxlen=BUILD_FAILURE_CONTEXT_LINES)
+        # Lazy arguments are only evaluated and formatted if a sink accepts the level (not in quiet mode).
+        lazy_logger = logger.opt(lazy=True)
         for chunk in build_logs:
             if 'stream' in chunk:
-                logger.debug(chunk['stream'].strip())
+                recent_output.append(chunk['stream'])
+                lazy_logger.debug("{}", lambda: chunk['stream'].strip())
+            error = chunk.get('error')
+            if error:
+                logger.error("Build failed!")
+                for line in recent_output:
+                    logger.error(line.strip())
+                logger.error(error.strip())
+                return False
+            aux = chunk.get('aux')
+            if aux and 'ID' in aux:
+                image_id = aux['ID']
         
-        logger.success("Build successful.")
+        if image_id:
+            logger.success(f"Build successful: {image_id}")
+        else:
+            logger.success("Build successful.")
         return True
-    except BuildError as e:
-        logger.error("Build failed!")
-        for log_line in e.build_log:
-            if 'stream' in log_line:
-                logger.error(log_line['stream'].strip())
-        return False
     except APIError as e:
         logger.error(f"Docker API Error during build: {e}")
         return False
 
-def push_image(client, image_name, tag):
-    """Pushes the Docker image to the registry."""
-    full_image_name = f"{image_name}:{tag}"
-    logger.info(f"Pushing image: {full_image_name}")
+def build_image_buildx(context_path, dockerfile_path, full_image_name, build_args=None, cache_from=None, labels=None):
+    """
+    Builds the Docker image with `docker buildx build` and loads it into the local daemon.
+    Cache sources are read straight from the registry and inline cache metadata is embedded
+    in the result, so the pushed image can serve as the cache source for the next build.
+    """
+    logger = _get_logger()
+    cmd = ["docker", "buildx", "build", "--load", "-t", full_image_name, "-f", dockerfile_path]
+    for cache_image in cache_from or []:
+        cmd.append(f"--cache-from=type=registry,ref={cache_image}")
+    if cache_from:
+        cmd.append("--cache-to=type=inline")
+    for key, value in (build_args or {}).items():
+        cmd.extend(["--build-arg", f"{key}={value}"])
+    for key, value in (labels or {}).items():
+        cmd.extend(["--label", f"{key}={value}"])
+    cmd.append(context_path)
+
+    try:
+        subprocess.run(cmd, check=True, env={**os.environ, "DOCKER_BUILDKIT": "1"})
+        logger.success("Build successful.")
+        return True
+    except FileNotFoundError:
+        logger.error("docker CLI not found. It is required for --buildx.")
+        return False
+    except subprocess.CalledProcessError as e:
+        logger.error(f"Build failed! docker buildx exited with status {e.returncode}")
+        return False
+
+# Push errors that a retry cannot fix.
+_PERMANENT_PUSH_ERRORS = ("denied", "unauthorized", "authentication required")
+
+def _push_once(client, image_name, tag):
+    """Runs a single push attempt. Returns None on success, otherwise the error message."""
+    from docker.errors import APIError
+    logger = _get_logger()
     try:
         # Push returns a stream of logs
         push_logs = client.images.push(image_name, tag=tag, stream=True, decode=True)
+        lazy_logger = logger.opt(lazy=True)
         for chunk in push_logs:
             if 'status' in chunk:
-                logger.info(f"{chunk.get('status')} {chunk.get('progress', '')}")
-            if 'error' in chunk:
-                logger.error(f"Push error: {chunk['error']}")
-                return False
-        
-        logger.success(f"Successfully pushed {full_image_name}")
-        return True
+                lazy_logger.info("{} {}", lambda: chunk['status'], lambda: chunk.get('progress', ''))
+            error = chunk.get('error')
+            if error:
+                logger.error(f"Push error: {error}")
+                return error
+        return None
     except APIError as e:
         logger.error(f"Docker API Error during push: {e}")
+        return str(e)
+
+def is_image_in_registry(client, full_image_name):
+    """
+    Checks whether the registry already serves the local image under this name.
+    Compares the registry's manifest digest with the digests the local image was
+    pushed or pulled with; any lookup failure is treated as "not present".
+    """
+    from docker.errors import APIError
+    try:
+        local_digests = client.images.get(full_image_name).attrs.get('RepoDigests') or []
+        if not local_digests:
+            return False
+        remote_digest = client.images.get_registry_data(full_image_name).id
+    except APIError:
         return False
+    return any(digest.rpartition('@')[2] == remote_digest for digest in local_digests)
 
-import re
-from git import InvalidGitRepositoryError
+def push_image(client, image_name, tag, retries=2):
+    """
+    Pushes the Docker image to the registry.
+    The daemon streams the layers itself and skips those the registry already has,
+    so a failed push is retried and resumes with the layers that are still missing.
+    """
+    logger = _get_logger()
+    full_image_name = f"{image_name}:{tag}"
+    if is_image_in_registry(client, full_image_name):
+        logger.success(f"{full_image_name} is already up to date in the registry. Skipping push.")
+        return True
+
+    for attempt in range(retries + 1):
+        if attempt:
+            delay = 2 ** attempt
+            logger.warning(f"Retrying push of {full_image_name} in {delay}s ({attempt}/{retries})")
+            time.sleep(delay)
+
+        logger.info(f"Pushing image: {full_image_name}")
+        error = _push_once(client, image_name, tag)
+        if error is None:
+            logger.success(f"Successfully pushed {full_image_name}")
+            return True
+        if any(marker in error.lower() for marker in _PERMANENT_PUSH_ERRORS):
+            break
+    return False
+
+# Matches [user@]host:path(.git) scp-style remotes, whose whole path is the image name
+# (e.g. group/sub/repo), and https/ssh/git/file URLs or plain paths, whose last two
+# path segments form the image name.
+_GIT_URL_RE = re.compile(
+    r'^(?:(?:[^@/:]+@)?[^/:]+:(?!//)(?P<scp_path>.+?)'
+    r'|(?:(?:https?|ssh|git|file)://[^/]*/)?(?:.*/)?(?P<path>[^/]+/[^/]+?))'
+    r'(?:\.git)?/?$'
+)
+
+# Matches x.y.z version tags with an optional 'v' prefix.
+_SEMVER_RE = re.compile(r'^(v?)(\d+)\.(\d+)\.(\d+)$')
 
 def infer_image_name(repo_url):
     """
     Infers image name from a git URL.
     Example: https://github.com/user/repo.git -> user/repo
              git@github.com:user/repo.git -> user/repo
+             git@gitlab.com:group/sub/repo.git -> group/sub/repo
     """
-    # Remove .git suffix
-    if repo_url.endswith(".git"):
-        repo_url = repo_url[:-4]
-    
-    # Handle ssh format (git@host:user/repo)
-    if ":" in repo_url and "://" not in repo_url:
-        parts = repo_url.split(":", 1)
-        if len(parts) == 2:
-            return parts[1]
-    
-    # Handle http/https format
-    parts = repo_url.split("/")
-    if len(parts) >= 2:
-        return f"{parts[-2]}/{parts[-1]}"
-    
+    m = _GIT_URL_RE.match(repo_url)
+    return (m.group('scp_path') or m.group('path')) if m else None
+
+def _highest_version_tag(tags):
+    """Returns the first x.y.z tag from tags sorted highest version first, or None."""
+    for tag in tags:
+        if _SEMVER_RE.match(tag):
+            return tag
     return None
 
+def get_local_latest_tag(repo):
+    """
+    Returns the highest x.y.z version tag of a local repository, or None if it has none.
+    Tags that are not plain versions (e.g. v2.0.0-rc1) are skipped.
+    """
+    # lstrip=2 rather than :short, which prints tags/<name> when a branch has the same name
+    output = repo.git.for_each_ref('--sort=-v:refname', '--format=%(refname:lstrip=2)', 'refs/tags')
+    return _highest_version_tag(output.splitlines())
+
+def get_remote_latest_tag(repo_url):
+    """
+    Returns the highest x.y.z version tag of a remote repository, or None if it has none.
+    Uses `git ls-remote` so no clone is required. Selection matches get_local_latest_tag.
+    """
+    output = _run_git("ls-remote", "--tags", "--refs", "--sort=-v:refname", "--", repo_url)
+    tags = (
+        ref[len("refs/tags/"):]
+        for _, _, ref in (line.partition("\t") for line in output.splitlines())
+        if ref.startswith("refs/tags/")
+    )
+    return _highest_version_tag(tags)
+
+DEFAULT_DOCKER_SOCKET = "/var/run/docker.sock"
+
+def create_docker_client():
+    """
+    Creates the Docker client.
+    Connects straight to the default local socket unless DOCKER_* connection settings
+    are present (or the socket does not exist), in which case docker.from_env() is used.
+    """
+    import docker
+    env_configured = any(os.environ.get(var) for var in ("DOCKER_HOST", "DOCKER_TLS_VERIFY", "DOCKER_CERT_PATH"))
+    if env_configured or not os.path.exists(DEFAULT_DOCKER_SOCKET):
+        return docker.from_env()
+    return docker.DockerClient(base_url=f"unix://{DEFAULT_DOCKER_SOCKET}", version="auto")
+
 def login_to_docker(client, username, password, registry=None):
     """Logs into a Docker registry."""
+    from docker.errors import APIError
+    logger = _get_logger()
     if not username or not password:
         logger.info("Skipping login (credentials not provided).")
         return True
@@ -115,24 +379,52 @@ def login_to_docker(client, username, password, registry=None):
         logger.error(f"Login failed: {e}")
         return False
 
-def run_pipeline(repo_url=None, branch="main", image_name=None, tag="latest", dockerfile_path="Dockerfile", build_args=None, username=None, password=None, registry=None, local_path=None):
+def remove_temp_dir(temp_dir):
+    """
+    Removes a temporary directory. Failures are not raised, so a leftover file cannot
+    turn a successful run into a failure, but a single warning names what was left behind.
+    """
+    logger = _get_logger()
+    failed_paths = []
+
+    def record_failure(function, path, exc):
+        failed_paths.append(path)
+
+    # onerror is deprecated in favour of onexc from Python 3.12 on
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(temp_dir, onexc=record_failure)
+    else:
+        shutil.rmtree(temp_dir, onerror=record_failure)
+
+    if failed_paths:
+        logger.warning(f"Could not fully remove temporary directory {temp_dir} ({len(failed_paths)} entries left, e.g. {failed_paths[0]})")
+
+def run_pipeline(repo_url=None, branch="main", image_name=None, tag="latest", dockerfile_path="Dockerfile", build_args=None, username=None, password=None, registry=None, local_path=None, full_history=False, cache_from=None, use_buildx=False, force_build=False):
     """
     Orchestrates the build and push process.
     If local_path is provided, uses it as context and skips cloning.
-    If repo_url is provided, clones it.
+    If repo_url is provided, clones it (shallow unless full_history is set).
+    cache_from lists images used as build cache; None defaults to the target image itself.
+    The build is skipped if the existing image was built from an identical context,
+    unless force_build is set.
     """
+    logger = _get_logger()
     # Validation
     if not image_name:
         logger.error("Image name could not be determined.")
         return False
 
     temp_dir = None
+    client = None
+    context_tar = None
+    context_dockerfile = None
     context_path = local_path
 
     try:
         # 1. Setup Docker Client
+        # One client (and its pooled daemon connection) serves every step below.
         try:
-            client = docker.from_env()
+            client = create_docker_client()
         except Exception as e:
             logger.error(f"Failed to connect to Docker daemon: {e}")
             logger.error("Please ensure Docker is running.")
@@ -143,23 +435,52 @@ def run_pipeline(repo_url=None, branch="main", image_name=None, tag="latest", do
              return False
 
         # 3. Prepare Context (Clone if needed)
-        if not context_path:
-            if not repo_url:
-                logger.error("No repository URL or local path provided.")
-                return False
-            
-            temp_dir = tempfile.mkdtemp()
-            context_path = temp_dir
-            if not clone_repo(repo_url, branch, temp_dir):
-                return False
-        else:
-            logger.info(f"Using local path as build context: {context_path}")
-
-        # 4. Build Image
+        # Pulling the cache images and cloning talk to different servers, so run them concurrently.
         full_image_name = f"{image_name}:{tag}"
-        if not build_image(client, context_path, dockerfile_path, full_image_name, build_args):
+        if cache_from is None:
+            cache_from = [full_image_name]
+
+        if not context_path and not repo_url:
+            logger.error("No repository URL or local path provided.")
+            return False
+
+        pull_future = None
+        cloned = True
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            if cache_from and not use_buildx:
+                pull_future = executor.submit(pull_cache_images, client, cache_from)
+
+            if not context_path:
+                temp_dir = tempfile.mkdtemp()
+                context_path = temp_dir
+                cloned = executor.submit(clone_repo, repo_url, branch, temp_dir, full_history).result()
+            else:
+                logger.info(f"Using local path as build context: {context_path}")
+
+        if pull_future is not None and pull_future.exception() is not None:
+            logger.warning(f"Failed to pull cache images: {pull_future.exception()}")
+        if not cloned:
             return False
 
+        # 4. Build Image (unless the existing image was built from the same context)
+        # The context is archived once and reused for both the fingerprint and the build.
+        try:
+            context_tar, context_dockerfile = create_build_context(context_path, dockerfile_path)
+            ctx_digest = compute_context_digest(context_tar, dockerfile_path, build_args)
+        except (OSError, tarfile.TarError) as e:
+            logger.warning(f"Could not fingerprint build context: {e}")
+            ctx_digest = None
+            if context_tar is not None:
+                context_tar.close()
+                context_tar = None
+
+        if ctx_digest and not force_build and get_image_label(client, full_image_name, CTX_DIGEST_LABEL) == ctx_digest:
+            logger.success(f"{full_image_name} is up to date with the build context. Skipping build.")
+        else:
+            labels = {CTX_DIGEST_LABEL: ctx_digest} if ctx_digest else None
+            if not build_image(client, context_path, dockerfile_path, full_image_name, build_args, cache_from, use_buildx, labels, context_tar, context_dockerfile):
+                return False
+
         # 5. Push Image
         if not push_image(client, image_name, tag):
             return False
@@ -168,9 +489,13 @@ def run_pipeline(repo_url=None, branch="main", image_name=None, tag="latest", do
 
     finally:
         # Cleanup
+        if context_tar is not None:
+            context_tar.close()
+        if client is not None:
+            client.close()
         if temp_dir:
             logger.info(f"Cleaning up temporary directory: {temp_dir}")
-            shutil.rmtree(temp_dir)
+            remove_temp_dir(temp_dir)
 
 def main():
     parser = argparse.ArgumentParser(description="Clone git repo (or use local), build Docker image, and push to registry.")
@@ -180,15 +505,21 @@ def main():
     parser.add_argument("--tag", default="latest", help="Image tag (default: latest)")
     parser.add_argument("--dockerfile", default="Dockerfile", help="Path to Dockerfile relative to repo root (default: Dockerfile)")
     parser.add_argument("--build-arg", action='append', help="Build arguments in KEY=VALUE format", dest="build_args")
+    parser.add_argument("--cache-from", action='append', help="Image to use as build cache source (default: the target image)", dest="cache_from")
+    parser.add_argument("--no-cache-from", action="store_true", help="Do not use any image as build cache source")
+    parser.add_argument("--buildx", action="store_true", help="Build with 'docker buildx' (BuildKit) instead of the Docker SDK")
+    parser.add_argument("--force-build", action="store_true", help="Build even if the existing image was built from an identical context")
     parser.add_argument("--username", help="Docker registry username (env: DOCKER_USERNAME)")
     parser.add_argument("--password", help="Docker registry password/token (env: DOCKER_PASSWORD)")
     parser.add_argument("--registry", help="Docker registry URL (default: Docker Hub)")
     parser.add_argument("--auto-version", action="store_true", help="Automatically bump patch version based on latest git tag")
+    parser.add_argument("--full-history", action="store_true", help="Clone the full git history instead of only the latest commit (remote builds only)")
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose output (INFO level). Default is quiet (ERROR only).")
     
     args = parser.parse_args()
 
     # Configure Logging
+    logger = _get_logger()
     logger.remove()
     log_level = "INFO" if args.verbose else "ERROR"
     logger.add(sys.stderr, level=log_level)
@@ -201,6 +532,8 @@ def main():
     # Detect local git repo if no repo arg
     current_repo_obj = None
     if not repo_url:
+        # GitPython is only needed to inspect a local checkout
+        from git import Repo, InvalidGitRepositoryError
         try:
             local_repo = Repo(os.getcwd())
             logger.info("Detected local git repository.")
@@ -233,46 +566,27 @@ def main():
         sys.exit(1)
 
     # Auto-version logic
+    latest_tag = None
     if args.auto_version:
         logger.info("Auto-versioning enabled.")
         try:
-            # If we don't have a local repo object yet (remote build), we can't easily get tags *before* cloning.
-            # However, for the 'Local Build' case, we have `current_repo_obj`.
-            # For 'Remote Build', run_pipeline clones it. adapting run_pipeline to return or handle versioning is complex.
-            # Strategy: Only support auto-version for Local or if we can peek at remote tags.
-            # Simpler: If local, use local tags. If remote, git ls-remote?
-            
-            # Let's stick to supporting it primarily for Local Builds or if we can access the repo.
+            # Local builds read tags from the checkout; remote builds ask the remote directly.
             if current_repo_obj:
-                tags = sorted(current_repo_obj.tags, key=lambda t: t.commit.committed_datetime)
-                if tags:
-                    latest_tag = str(tags[-1])
-                    logger.info(f"Latest git tag: {latest_tag}")
-                    
-                    # Simple semantic version bump logic
-                    # Remove 'v' prefix if present
-                    version_str = latest_tag.lstrip('v')
-                    parts = version_str.split('.')
-                    if len(parts) >= 3:
-                        # Bump patch
-                        try:
-                            parts[-1] = str(int(parts[-1]) + 1)
-                            new_version = ".".join(parts)
-                            if latest_tag.startswith('v'):
-                                new_version = f"v{new_version}"
-                            tag = new_version
-                            logger.info(f"Bumped version to: {tag}")
-                        except ValueError:
-                            logger.warning(f"Could not parse version {latest_tag} as semver. using default tag.")
-                    else:
-                         logger.warning(f"Tag {latest_tag} is not standard semantic versioning (x.y.z). Skipping bump.")
-                else:
-                    logger.info("No git tags found. Defaults to 'v0.0.1'?")
-                    tag = "v0.0.1"
-                    logger.info(f"Initial version: {tag}")
+                latest_tag = get_local_latest_tag(current_repo_obj)
             else:
-                 # TODO: Support remote tag listing (git ls-remote)
-                 logger.warning("Auto-version currently only supported for local git repositories.")
+                latest_tag = get_remote_latest_tag(repo_url)
+
+            if latest_tag:
+                logger.info(f"Latest git tag: {latest_tag}")
+                
+                # Simple semantic version bump logic: bump the patch, keep an optional 'v' prefix
+                prefix, major, minor, patch = _SEMVER_RE.match(latest_tag).groups()
+                tag = f"{prefix}{major}.{minor}.{int(patch) + 1}"
+                logger.info(f"Bumped version to: {tag}")
+            else:
+                logger.info("No x.y.z version tags found. Defaults to 'v0.0.1'?")
+                tag = "v0.0.1"
+                logger.info(f"Initial version: {tag}")
                  
         except Exception as e:
             logger.error(f"Failed to auto-version: {e}")
@@ -281,14 +595,20 @@ def main():
     username = args.username or os.getenv("DOCKER_USERNAME")
     password = args.password or os.getenv("DOCKER_PASSWORD")
 
+    # The bumped tag does not exist yet, so the previous version is the cache source
+    cache_from = args.cache_from
+    if args.no_cache_from:
+        cache_from = []
+    elif cache_from is None and latest_tag:
+        cache_from = [f"{image_name}:{latest_tag}"]
+
     build_args_dict = {}
-    if args.build_args:
-        for arg in args.build_args:
-            if '=' in arg:
-                key, value = arg.split('=', 1)
-                build_args_dict[key] = value
-            else:
-                logger.warning(f"Skipping malformed build argument: {arg}")
+    for arg in args.build_args or []:
+        key, sep, value = arg.partition('=')
+        if sep:
+            build_args_dict[key] = value
+        else:
+            logger.warning(f"Skipping malformed build argument: {arg}")
 
     success = run_pipeline(
         repo_url=repo_url,
@@ -300,7 +620,11 @@ def main():
         username=username,
         password=password,
         registry=args.registry,
-        local_path=local_path
+        local_path=local_path,
+        full_history=args.full_history,
+        cache_from=cache_from,
+        use_buildx=args.buildx,
+        force_build=args.force_build
     )
 
     if not success:
@@ -0,0 +1,118 @@
+import io
+import subprocess
+import tarfile
+import tempfile
+
+import pytest
+
+from buildpub.main import (
+    _highest_version_tag,
+    compute_context_digest,
+    get_local_latest_tag,
+    get_remote_latest_tag,
+    infer_image_name,
+)
+
+
+@pytest.mark.parametrize("repo_url, expected", [
+    ("https://github.com/user/repo.git", "user/repo"),
+    ("https://github.com/user/repo", "user/repo"),
+    ("https://github.com/user/repo/", "user/repo"),
+    ("https://host:8080/user/repo.git", "user/repo"),
+    ("ssh://git@host:22/user/repo.git", "user/repo"),
+    ("git@github.com:user/repo.git", "user/repo"),
+    ("github.com:user/repo.git", "user/repo"),
+    ("myalias:user/repo", "user/repo"),
+    ("git@gitlab.com:group/sub/repo.git", "group/sub/repo"),
+    ("git@ssh.dev.azure.com:v3/org/proj/repo", "v3/org/proj/repo"),
+    ("file:///srv/git/user/repo.git", "user/repo"),
+    ("/srv/git/user/repo.git", "user/repo"),
+    ("../upstream/repo.git", "upstream/repo"),
+    ("repo", None),
+])
+def test_infer_image_name(repo_url, expected):
+    assert infer_image_name(repo_url) == expected
+
+
+@pytest.mark.parametrize("tags, expected", [
+    (["v2.0.0-rc1", "v1.2.10", "v1.2.9"], "v1.2.10"),
+    (["1.0.0", "0.9.9"], "1.0.0"),
+    (["release", "nightly"], None),
+    ([], None),
+])
+def test_highest_version_tag(tags, expected):
+    assert _highest_version_tag(tags) == expected
+
+
+@pytest.fixture
+def tagged_repo(tmp_path):
+    """A repository tagged v1.2.9, v1.2.10 and v2.0.0-rc1, with a branch also named v1.2.10."""
+    def git(*args):
+        subprocess.run(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+            cwd=tmp_path, check=True, capture_output=True
+        )
+
+    git("init", "-q")
+    git("commit", "-q", "--allow-empty", "-m", "initial")
+    for tag in ("v1.2.9", "v1.2.10", "v2.0.0-rc1"):
+        git("tag", tag)
+    git("branch", "v1.2.10")
+    return tmp_path
+
+
+def test_get_local_latest_tag(tagged_repo):
+    from git import Repo
+
+    assert get_local_latest_tag(Repo(tagged_repo)) == "v1.2.10"
+
+
+def test_get_remote_latest_tag(tagged_repo):
+    assert get_remote_latest_tag(str(tagged_repo)) == "v1.2.10"
+
+
+def make_context_tar(files, mtime=0, uid=0, uname="root"):
+    """Builds a build context archive from {name: (content, mode)}."""
+    context_tar = tempfile.TemporaryFile()
+    with tarfile.open(fileobj=context_tar, mode="w") as archive:
+        for name, (content, mode) in sorted(files.items()):
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            info.mode = mode
+            info.mtime = mtime
+            info.uid = uid
+            info.uname = uname
+            archive.addfile(info, io.BytesIO(content))
+    context_tar.seek(0)
+    return context_tar
+
+
+CONTEXT_FILES = {
+    "Dockerfile": (b"FROM alpine\nCOPY run.sh /\n", 0o644),
+    "run.sh": (b"#!/bin/sh\necho hi\n", 0o755),
+}
+
+
+def context_digest(files=CONTEXT_FILES, dockerfile_path="Dockerfile", build_args=None, **tar_options):
+    with make_context_tar(files, **tar_options) as context_tar:
+        return compute_context_digest(context_tar, dockerfile_path, build_args)
+
+
+def test_context_digest_ignores_mtime_and_owner():
+    assert context_digest() == context_digest(mtime=1700000000, uid=1000, uname="builder")
+
+
+@pytest.mark.parametrize("changes", [
+    {"files": {**CONTEXT_FILES, "run.sh": (b"#!/bin/sh\necho bye\n", 0o755)}},
+    {"files": {**CONTEXT_FILES, "run.sh": (b"#!/bin/sh\necho hi\n", 0o644)}},
+    {"dockerfile_path": "build/Dockerfile"},
+    {"build_args": {"ENV": "prod"}},
+])
+def test_context_digest_changes_with_build_inputs(changes):
+    assert context_digest(**changes) != context_digest()
+
+
+def test_context_digest_rewinds_archive():
+    with make_context_tar(CONTEXT_FILES) as context_tar:
+        compute_context_digest(context_tar, "Dockerfile")
+        assert context_tar.tell() == 0